@@ -21,144 +21,330 @@ Legacy single-recipient fallback (kept for compatibility):
 """
 
 from __future__ import annotations
+import hashlib
+import heapq
+import importlib
+import io
 import os
 import sys
+import json
+import time
 import datetime as dt
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from operator import attrgetter
 from typing import Dict, List, Any, Optional
 
-import requests
-import yaml
+from utils import Entry
 
-from sources import arxiv as src_arxiv
-from sources import openreview as src_openreview
-from sources import acl as src_acl
-from sources import reddit as src_reddit
-from sources import hn as src_hn
-from sources import hackernoon as src_hackernoon
+# yaml, requests and the sources.* modules are imported where they are used, so
+# a run only pays for what it touches (e.g. disabled sources are never loaded).
 
 
 # ---------------------------
 # Config / Fetch
 # ---------------------------
+# Stand-in "published" for undated entries. Sources emit tz-aware UTC datetimes, so the
+# fallback must be aware too or mixed buckets fail to compare.
+_EPOCH = dt.datetime.min.replace(tzinfo=dt.timezone.utc)
+_EPOCH_TS = _EPOCH.timestamp()
+
+# (config key == sources.<module> name, bucket name), in digest order.
+_SOURCES = (
+    ("arxiv", "arXiv"),
+    ("openreview", "OpenReview"),
+    ("acl", "ACL Anthology"),
+    ("reddit", "Reddit"),
+    ("hn", "Hacker News"),
+    ("hackernoon", "Hackernoon"),
+)
+
+# path -> (stamp, parsed config); see load_config.
+_CONFIG_MEMO: Dict[str, Any] = {}
+
+
+def _read_config_cache(cache_path: str, stamp: List[int]) -> Optional[Dict[str, Any]]:
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cached, dict) or cached.get("stamp") != stamp:
+        return None
+    return cached.get("config")
+
+
+def _write_config_cache(cache_path: str, stamp: List[int], cfg: Dict[str, Any]) -> None:
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"stamp": stamp, "config": cfg}, f)
+        os.replace(tmp_path, cache_path)
+    except (OSError, TypeError, ValueError):
+        # Cache is best-effort (read-only checkout, non-JSON YAML values, ...).
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
 def load_config(path: str = "config.yaml") -> Dict[str, Any]:
+    """
+    Parse config.yaml, reusing a JSON sidecar (<path>.cache.json) when the YAML
+    file's (mtime_ns, size) hasn't changed since it was written.
+
+    The result is also kept in-process per path (same stamp check), so repeated
+    calls return the same dict — treat it as read-only.
+    """
+    st = os.stat(path)
+    stamp = [st.st_mtime_ns, st.st_size]
+    hit = _CONFIG_MEMO.get(path)
+    if hit is not None and hit[0] == stamp:
+        return hit[1]
+
+    cache_path = f"{path}.cache.json"
+    cfg = _read_config_cache(cache_path, stamp)
+    if cfg is not None:
+        _CONFIG_MEMO[path] = (stamp, cfg)
+        return cfg
+
+    import yaml
+
+    # libyaml-backed loader when PyYAML was built with it; pure-Python otherwise.
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
     with open(path, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f)
+        cfg = yaml.load(f, Loader=loader)
+    _write_config_cache(cache_path, stamp, cfg)
+    _CONFIG_MEMO[path] = (stamp, cfg)
+    return cfg
+
 
+def fetch_all(cfg: Dict[str, Any], max_per_source: Optional[int] = None) -> Dict[str, List[Entry]]:
+    """
+    Return a dict of {source_name: [entries...]}, de-duplicated and sorted
+    newest->oldest per source.
 
-def fetch_all(cfg: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
-    """Return a dict of {source_name: [entries...]} sorted newest->oldest per source."""
+    With max_per_source (> 0), only the newest max_per_source entries of each
+    bucket are kept (partial heap select instead of a full sort).
+    """
     gf = {
         "lookback_days": int(cfg.get("lookback_days", 7)),
-        "include_keywords": cfg.get("include_keywords", []),
-        "exclude_keywords": cfg.get("exclude_keywords", []),
-        "priority_authors": [a.lower() for a in cfg.get("priority_authors", [])],
+        "include_keywords": tuple(cfg.get("include_keywords") or ()),
+        "exclude_keywords": tuple(cfg.get("exclude_keywords") or ()),
+        "priority_authors": frozenset(a.lower() for a in cfg.get("priority_authors") or ()),
     }
     scfg = cfg.get("sources", {}) or {}
 
-    buckets: Dict[str, List[Dict[str, Any]]] = {}
-
-    if (scfg.get("arxiv") or {}).get("enabled", True):
-        buckets["arXiv"] = src_arxiv.fetch(scfg.get("arxiv", {}), gf)
-    if (scfg.get("openreview") or {}).get("enabled", True):
-        buckets["OpenReview"] = src_openreview.fetch(scfg.get("openreview", {}), gf)
-    if (scfg.get("acl") or {}).get("enabled", True):
-        buckets["ACL Anthology"] = src_acl.fetch(scfg.get("acl", {}), gf)
-    if (scfg.get("reddit") or {}).get("enabled", True):
-        buckets["Reddit"] = src_reddit.fetch(scfg.get("reddit", {}), gf)
-    if (scfg.get("hn") or {}).get("enabled", True):
-        buckets["Hacker News"] = src_hn.fetch(scfg.get("hn", {}), gf)
-    if (scfg.get("hackernoon") or {}).get("enabled", True):
-        buckets["Hackernoon"] = src_hackernoon.fetch(scfg.get("hackernoon", {}), gf)
-
+    tasks = []
+    for key, name in _SOURCES:
+        src_cfg = scfg.get(key) or {}
+        if src_cfg.get("enabled", True):
+            module = importlib.import_module(f"sources.{key}")
+            tasks.append((name, module.fetch, src_cfg))
+
+    # Every source talks to a different host, so fetch them concurrently.
+    results: Dict[str, List[Entry]] = {}
+    if tasks:
+        with ThreadPoolExecutor(max_workers=len(tasks)) as pool:
+            futures = {pool.submit(fn, src_cfg, gf): name for name, fn, src_cfg in tasks}
+            for fut in as_completed(futures):
+                results[futures[fut]] = fut.result()
+
+    # Keep buckets in the configured (not completion) order for rendering.
+    buckets: Dict[str, List[Entry]] = {name: results[name] for name, _, _ in tasks}
+
+    # Undated entries get _EPOCH once here, so the sort key is a plain C-level getter.
+    by_published = attrgetter("published")
     for items in buckets.values():
-        items.sort(key=lambda x: x.get("published") or dt.datetime.min, reverse=True)
+        for it in items:
+            if it.published is None:
+                it.published = _EPOCH
+                it.ts = _EPOCH_TS  # keep Entry.ts (set in __post_init__) in step with published
+
+    # De-dupe before ranking so duplicates can't eat into the cap.
+    dedupe_buckets(buckets)
+    if max_per_source is not None and max_per_source > 0:
+        for name, items in buckets.items():
+            buckets[name] = heapq.nlargest(max_per_source, items, key=by_published)
+    else:
+        for items in buckets.values():
+            items.sort(key=by_published, reverse=True)
 
     return buckets
 
 
+# fetch_all results shared across callers in one process: key -> (fetched_at, buckets)
+_FETCH_CACHE: Dict[str, Any] = {}
+_FETCH_TTL_SECONDS = 900
+
+
+def _config_key(cfg: Dict[str, Any]) -> str:
+    blob = json.dumps(cfg, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(blob).hexdigest()
+
+
+def cached_fetch_all(
+    cfg: Dict[str, Any],
+    max_per_source: Optional[int] = None,
+    ttl: float = _FETCH_TTL_SECONDS,
+) -> Dict[str, List[Entry]]:
+    """
+    fetch_all(cfg, max_per_source), shared for `ttl` seconds between callers with an identical config
+    (e.g. several digest builds in one Streamlit process). Returns fresh bucket
+    lists each call so callers can re-bind/filter them without affecting others.
+    """
+    key = f"{_config_key(cfg)}:{max_per_source or 0}"
+    now = time.monotonic()
+    hit = _FETCH_CACHE.get(key)
+    if hit is None or now - hit[0] > ttl:
+        hit = (now, fetch_all(cfg, max_per_source=max_per_source))
+        # evict on write, so keys for configs no longer in use don't live forever
+        for old_key, (stamp, _) in list(_FETCH_CACHE.items()):
+            if now - stamp > ttl:
+                _FETCH_CACHE.pop(old_key, None)
+        _FETCH_CACHE[key] = hit
+    return {name: list(items) for name, items in hit[1].items()}
+
+
 # ---------------------------
 # De-duplication
 # ---------------------------
-def dedupe_buckets(buckets: Dict[str, List[Dict[str, Any]]]) -> Dict[str, List[Dict[str, Any]]]:
-    """Remove duplicates inside each source bucket using (id or link) as key."""
-    for name, items in list(buckets.items()):
-        seen = set()
-        keep: List[Dict[str, Any]] = []
+def dedupe_buckets(buckets: Dict[str, List[Entry]]) -> Dict[str, List[Entry]]:
+    """
+    Remove duplicates inside each source bucket using (id or link) as key.
+    Entries with neither are kept as-is. The newest duplicate (by published)
+    wins, in the position of the first one seen.
+    """
+    for name, items in buckets.items():
+        seen: Dict[Any, Entry] = {}
         for en in items:
-            key = (name, en.get("id") or en.get("link") or "")
-            if key in seen:
-                continue
-            seen.add(key)
-            keep.append(en)
-        buckets[name] = keep
+            key = en.id or en.link or id(en)
+            kept = seen.get(key)
+            if kept is None or en.ts > kept.ts:
+                seen[key] = en
+        buckets[name] = list(seen.values())
     return buckets
 
 
 # ---------------------------
 # Rendering
 # ---------------------------
-def _iter_limited(items: List[Dict[str, Any]], limit: Optional[int]):
+_ELLIPSIS = "…"
+_SUMMARY_CHARS = 280
+
+
+# Single-pass escaping for text and double-quoted attribute values.
+_HTML_ESCAPE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;"})
+
+# Item markup, bound once at import. Every interpolated value is escaped by the caller.
+_HTML_ITEM = '\n<li><a href="{link}">{title}</a>'.format
+_HTML_SUMMARY = "\n<br><small>{summary}</small>".format
+
+
+def _truncate(text: str, limit: int) -> str:
+    """Cut text at the last space before `limit` and append an ellipsis."""
+    cut = text.rfind(" ", 0, limit)
+    return (text[:cut] if cut > 0 else text[:limit]) + _ELLIPSIS
+
+
+def _iter_limited(items: List[Entry], limit: Optional[int]):
     if limit is None or limit <= 0:
         yield from items
     else:
         yield from items[:limit]
 
 
-def render_html(buckets: Dict[str, List[Dict[str, Any]]], max_per_source: Optional[int] = None) -> str:
+def render_html(buckets: Dict[str, List[Entry]], max_per_source: Optional[int] = None) -> str:
     today = dt.datetime.now().strftime("%Y-%m-%d")
-    parts: List[str] = [f"<h2>AI &amp; AI Security — Daily Digest ({today})</h2>"]
+    if not any(buckets.values()):
+        return f"<h2>AI &amp; AI Security — Daily Digest ({today})</h2>\n<p>No new items.</p>"
+    buf = io.StringIO()
+    write = buf.write
+    write(f"<h2>AI &amp; AI Security — Daily Digest ({today})</h2>")
     for name, items in buckets.items():
         if not items:
             continue
         shown = len(items) if (max_per_source is None or max_per_source <= 0) else min(len(items), max_per_source)
-        parts.append(f"<h3>{name} ({shown})</h3>")
-        parts.append("<ul>")
+        write(f"\n<h3>{name} ({shown})</h3>\n<ul>")
         for it in _iter_limited(items, max_per_source):
-            title = (it.get("title") or "").strip()
-            link = it.get("pdf") or it.get("link") or "#"
-            summary = (it.get("summary") or "").strip()
-            if len(summary) > 280:
-                summary = summary[:280].rsplit(" ", 1)[0] + "…"
-            safe_title = (
-                title.replace("&", "&amp;")
-                     .replace("<", "&lt;")
-                     .replace(">", "&gt;")
-            )
-            parts.append(
-                f"<li><a href=\"{link}\">{safe_title}</a>"
-                + (f"<br><small>{summary}</small>" if summary else "")
-                + "</li>"
-            )
-        parts.append("</ul>")
-    return "\n".join(parts)
-
-
-def render_plaintext(buckets: Dict[str, List[Dict[str, Any]]], max_per_source: Optional[int] = None) -> str:
+            title = (it.title or "").strip()
+            link = it.pdf or it.link or "#"
+            summary = (it.summary or "").strip()
+            if len(summary) > _SUMMARY_CHARS:
+                summary = _truncate(summary, _SUMMARY_CHARS)
+            write(_HTML_ITEM(link=link.translate(_HTML_ESCAPE), title=title.translate(_HTML_ESCAPE)))
+            if summary:
+                write(_HTML_SUMMARY(summary=summary.translate(_HTML_ESCAPE)))
+            write("\n</li>")
+        write("\n</ul>")
+    return buf.getvalue()
+
+
+def render_plaintext(buckets: Dict[str, List[Entry]], max_per_source: Optional[int] = None) -> str:
     today = dt.datetime.now().strftime("%Y-%m-%d")
-    lines: List[str] = [f"AI & AI Security — Daily Digest ({today})", ""]
+    if not any(buckets.values()):
+        return f"AI & AI Security — Daily Digest ({today})\n\nNo new items."
+    buf = io.StringIO()
+    write = buf.write
+    write(f"AI & AI Security — Daily Digest ({today})\n\n")
+    cap_desc = "all" if (max_per_source is None or max_per_source <= 0) else str(max_per_source)
     for name, items in buckets.items():
         if not items:
             continue
-        cap_desc = "all" if (max_per_source is None or max_per_source <= 0) else str(max_per_source)
-        lines.append(f"{name} (showing {cap_desc})")
+        write(f"{name} (showing {cap_desc})\n")
         for it in _iter_limited(items, max_per_source):
-            title = (it.get("title") or "").strip()
-            link = it.get("pdf") or it.get("link") or ""
-            summary = (it.get("summary") or "").strip()
-            if len(summary) > 280:
-                summary = summary[:280].rsplit(" ", 1)[0] + "…"
-            lines.append(f"- {title}")
+            title = (it.title or "").strip()
+            link = it.pdf or it.link or ""
+            summary = (it.summary or "").strip()
+            if len(summary) > _SUMMARY_CHARS:
+                summary = _truncate(summary, _SUMMARY_CHARS)
+            write(f"- {title}\n")
             if link:
-                lines.append(f"  {link}")
+                write(f"  {link}\n")
             if summary:
-                lines.append(f"  {summary}")
-        lines.append("")
-    return "\n".join(lines).strip()
+                write(f"  {summary}\n")
+        write("\n")
+    return buf.getvalue().strip()
 
 
 # ---------------------------
 # Send via Resend (Broadcasts preferred)
 # ---------------------------
+_RESEND_SESSION = None
+
+
+def _resend_session():
+    """One keep-alive session per process, so consecutive API calls share a TLS connection."""
+    global _RESEND_SESSION
+    if _RESEND_SESSION is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        # Retry connect errors and "come back later" answers (429/503); both mean
+        # Resend did not act on the request, so re-POSTing cannot double-send.
+        # Read errors are not retried: the POST may already have been applied.
+        retry = Retry(
+            total=3,
+            read=0,
+            backoff_factor=0.5,
+            status_forcelist=(429, 503),
+            allowed_methods=None,
+            raise_on_status=False,
+        )
+        _RESEND_SESSION = requests.Session()
+        _RESEND_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry))
+    return _RESEND_SESSION
+
+
+def _json_body(payload: Dict[str, Any]) -> bytes:
+    """Serialize a request payload, using orjson when it's installed."""
+    try:
+        import orjson
+    except ImportError:
+        return json.dumps(payload).encode("utf-8")
+    return orjson.dumps(payload)
+
+
 def _resend_headers(api_key: str) -> Dict[str, str]:
     return {
         "Authorization": f"Bearer {api_key}",
@@ -192,11 +378,13 @@ def send_via_resend_broadcast(html: str, plain: str | None = None) -> None:
     if reply_to:
         payload["reply_to"] = reply_to
 
+    session = _resend_session()
+
     # 1) Create broadcast
-    resp = requests.post(
+    resp = session.post(
         "https://api.resend.com/broadcasts",
         headers=_resend_headers(api_key),
-        json=payload,
+        data=_json_body(payload),
         timeout=30,
     )
     if resp.status_code >= 300:
@@ -207,10 +395,10 @@ def send_via_resend_broadcast(html: str, plain: str | None = None) -> None:
         raise RuntimeError(f"Resend Broadcast create response missing id: {resp.text}")
 
     # 2) Send broadcast now (use scheduledAt if you want delayed delivery)
-    send_resp = requests.post(
+    send_resp = session.post(
         f"https://api.resend.com/broadcasts/{broadcast_id}/send",
         headers=_resend_headers(api_key),
-        json={},  # add {"scheduledAt": "in 1 min"} if desired
+        data=_json_body({}),  # add {"scheduledAt": "in 1 min"} if desired
         timeout=30,
     )
     if send_resp.status_code >= 300:
@@ -236,10 +424,10 @@ def send_via_resend_single(html: str, plain: str | None = None) -> None:
     if reply_to:
         payload["reply_to"] = reply_to
 
-    resp = requests.post(
+    resp = _resend_session().post(
         "https://api.resend.com/emails",
         headers=_resend_headers(api_key),
-        json=payload,
+        data=_json_body(payload),
         timeout=30,
     )
     if resp.status_code >= 300:
@@ -286,14 +474,14 @@ def _parse_limit(env_val: str | None, cfg_val: Any) -> Optional[int]:
 # ---------------------------
 def main() -> int:
     cfg = load_config("config.yaml")
-    buckets = fetch_all(cfg)
-    buckets = dedupe_buckets(buckets)
 
     # Determine limit: env > config.email.max_per_source > unlimited
     env_limit = os.getenv("MAX_PER_SOURCE")
     cfg_limit = (cfg.get("email") or {}).get("max_per_source")
     max_per_source = _parse_limit(env_limit, cfg_limit)
 
+    buckets = fetch_all(cfg, max_per_source=max_per_source)
+
     html = render_html(buckets, max_per_source=max_per_source)
     plain = render_plaintext(buckets, max_per_source=max_per_source)
 
@@ -12,28 +12,24 @@ Usage examples:
 
 from __future__ import annotations
 import argparse
+import importlib
 import sys
 import traceback
 from datetime import datetime
 from typing import Dict, Any, List
 
-# Local imports from your project
+# Local imports from your project (sources.* are imported on demand, so
+# `--source reddit` never loads openreview / arxiv and their dependencies)
 from daily_digest import load_config
-from sources import arxiv as src_arxiv
-from sources import openreview as src_openreview
-from sources import acl as src_acl
-from sources import reddit as src_reddit
-from sources import hn as src_hn
-from sources import hackernoon as src_hackernoon
 from utils import format_authors
 
 SOURCE_MAP = {
-    "arxiv": ("arXiv", src_arxiv.fetch),
-    "openreview": ("OpenReview", src_openreview.fetch),
-    "acl": ("ACL Anthology", src_acl.fetch),
-    "reddit": ("Reddit", src_reddit.fetch),
-    "hn": ("Hacker News", src_hn.fetch),
-    "hackernoon": ("Hackernoon", src_hackernoon.fetch),
+    "arxiv": "arXiv",
+    "openreview": "OpenReview",
+    "acl": "ACL Anthology",
+    "reddit": "Reddit",
+    "hn": "Hacker News",
+    "hackernoon": "Hackernoon",
 }
 
 def parse_args() -> argparse.Namespace:
@@ -62,7 +58,7 @@ def main() -> int:
         "lookback_days": int(args.lookback_days if args.lookback_days is not None else cfg.get("lookback_days", 1)),
         "include_keywords": csv_to_list(args.include) if args.include is not None else (cfg.get("include_keywords") or []),
         "exclude_keywords": csv_to_list(args.exclude) if args.exclude is not None else (cfg.get("exclude_keywords") or []),
-        "priority_authors": [a.lower() for a in (cfg.get("priority_authors") or [])],
+        "priority_authors": frozenset(a.lower() for a in (cfg.get("priority_authors") or [])),
     }
 
     src_cfg: Dict[str, Any] = cfg.get("sources", {}) or {}
@@ -77,7 +73,7 @@ def main() -> int:
 
     any_items = False
     for key in wanted:
-        nice_name, fetch_fn = SOURCE_MAP[key]
+        nice_name = SOURCE_MAP[key]
         enabled = bool((src_cfg.get(key) or {}).get("enabled", True))
         if not enabled:
             print(f"[{nice_name}] SKIPPED (disabled in config)")
@@ -85,6 +81,7 @@ def main() -> int:
 
         cfg_for_src = src_cfg.get(key, {})
         try:
+            fetch_fn = importlib.import_module(f"sources.{key}").fetch
             items = fetch_fn(cfg_for_src, global_filters)  # type: ignore[arg-type]
         except Exception as e:
             print(f"[{nice_name}] ERROR: {e.__class__.__name__}: {e}")
@@ -101,20 +98,21 @@ def main() -> int:
         # Optionally show a few items
         nshow = max(0, args.show or 0)
         for i, en in enumerate(items[:nshow], 1):
-            date_s = en.get("published").strftime("%Y-%m-%d %H:%M") if en.get("published") else ""
-            authors = format_authors(en.get("authors"))
-            title = en.get("title", "").strip()
-            link = en.get("pdf") or en.get("link") or ""
+            date_s = en.published.strftime("%Y-%m-%d %H:%M") if en.published else ""
+            authors = format_authors(en.authors)
+            title = en.title.strip()
+            link = en.pdf or en.link or ""
             print(f"  {i:2d}. {title}")
             if date_s or authors:
                 print(f"      {date_s}  {authors}")
             if link:
                 print(f"      {link}")
-            if en.get("summary"):
+            if en.summary:
                 # keep summary short for console
-                s = en["summary"].replace("\n", " ").strip()
+                s = en.summary.replace("\n", " ").strip()
                 if len(s) > 200:
-                    s = s[:200].rsplit(" ", 1)[0] + "…"
+                    cut = s.rfind(" ", 0, 200)
+                    s = (s[:cut] if cut > 0 else s[:200]) + "…"
                 print(f"      {s}")
 
         if nshow and count > nshow:
@@ -1,10 +1,10 @@
 # digest_helpers.py
-from daily_digest import load_config, fetch_all, render_html, render_plaintext, send_via_resend
+from daily_digest import load_config, cached_fetch_all, render_html, render_plaintext
 import os
 
 def build_digest(max_per_source=10):
     cfg = load_config("config.yaml")
-    buckets = fetch_all(cfg)
+    buckets = cached_fetch_all(cfg, max_per_source=max_per_source)
     html = render_html(buckets, max_per_source=max_per_source)
     plain = render_plaintext(buckets, max_per_source=max_per_source)
     return html, plain
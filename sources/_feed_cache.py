@@ -0,0 +1,108 @@
+# sources/_feed_cache.py — conditional-GET (ETag / If-Modified-Since) cache for feeds
+import os
+import pickle
+import sqlite3
+import time
+from contextlib import closing
+
+import feedparser
+import requests
+
+from sources import _http
+
+CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "feed_cache.sqlite"
+)
+# Rows not stored or revalidated for this long are dropped, so URLs that stop being
+# requested (e.g. date-bounded arXiv queries from earlier days) don't pile up.
+MAX_AGE_SECONDS = 7 * 86400
+_MIGRATED = False
+
+def _connect():
+    global _MIGRATED
+    os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+    con = sqlite3.connect(CACHE_PATH, timeout=30)
+    con.execute(
+        "CREATE TABLE IF NOT EXISTS feeds ("
+        " url TEXT PRIMARY KEY, etag TEXT, modified TEXT, entries BLOB, stored REAL)"
+    )
+    if not _MIGRATED:
+        # caches written before rows were timestamped lack the column
+        cols = {row[1] for row in con.execute("PRAGMA table_info(feeds)")}
+        if "stored" not in cols:
+            con.execute("ALTER TABLE feeds ADD COLUMN stored REAL")
+        _MIGRATED = True
+    return con
+
+def _lookup(url):
+    try:
+        with closing(_connect()) as con:
+            row = con.execute(
+                "SELECT etag, modified, entries FROM feeds WHERE url = ?", (url,)
+            ).fetchone()
+    except (sqlite3.Error, OSError):
+        return None, None, None
+    return row if row else (None, None, None)
+
+def _store(url, etag, modified, entries):
+    now = time.time()
+    try:
+        with closing(_connect()) as con, con:
+            con.execute(
+                "INSERT OR REPLACE INTO feeds (url, etag, modified, entries, stored)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (url, etag, modified, pickle.dumps(entries), now),
+            )
+            con.execute(
+                "DELETE FROM feeds WHERE stored IS NULL OR stored < ?", (now - MAX_AGE_SECONDS,)
+            )
+    except (sqlite3.Error, OSError, pickle.PicklingError):
+        pass  # cache is best-effort
+
+def _touch(url):
+    # a 304 revalidated the row, so it is still in use
+    try:
+        with closing(_connect()) as con, con:
+            con.execute("UPDATE feeds SET stored = ? WHERE url = ?", (time.time(), url))
+    except (sqlite3.Error, OSError):
+        pass
+
+def _feedparser_entries(content):
+    return feedparser.parse(content).entries or []
+
+def parse_entries(url, parse=_feedparser_entries, headers=None):
+    """
+    Return the parsed entries of the feed at url, sending the ETag / Last-Modified
+    seen on the previous run. On 304 Not Modified the entries stored then are
+    replayed; if that row can't be unpickled (corrupt, or written by an incompatible
+    version) the feed is downloaded again without validators. Cache errors never fail
+    the fetch. Bytes come from the shared session in sources/_http.py (paced per host,
+    429 / 503 retried with backoff) and are handed to feedparser already downloaded,
+    or to `parse` (bytes -> list of entries) when a source brings its own parser.
+    """
+    etag, modified, blob = _lookup(url)
+    try:
+        resp = _http.get_feed(url, etag=etag, modified=modified, headers=headers)
+    except requests.RequestException:
+        return []
+
+    if resp.status_code == 304 and blob is not None:
+        try:
+            entries = pickle.loads(blob)
+        except Exception:
+            try:
+                resp = _http.get_feed(url, headers=headers)
+            except requests.RequestException:
+                return []
+        else:
+            _touch(url)
+            return entries
+    if resp.status_code != 200:
+        return []
+
+    entries = parse(resp.content)
+    new_etag = resp.headers.get("ETag")
+    new_modified = resp.headers.get("Last-Modified")
+    if entries and (new_etag or new_modified):
+        _store(url, new_etag, new_modified, entries)
+    return entries
@@ -0,0 +1,72 @@
+# sources/_feed_parse.py — lightweight RSS 2.0 / Atom parse into feedparser-shaped dicts
+from io import BytesIO
+import xml.etree.ElementTree as ET
+
+from sources._feed_cache import _feedparser_entries
+
+_ATOM = "{http://www.w3.org/2005/Atom}"
+_CONTENT = "{http://purl.org/rss/1.0/modules/content/}"
+_DC = "{http://purl.org/dc/elements/1.1/}"
+
+def _text(el):
+    if el is None:
+        return ""
+    if len(el):  # Atom type="xhtml": markup is child elements, keep the text
+        return "".join(el.itertext()).strip()
+    return (el.text or "").strip()
+
+def _with_id(item_id, entry):
+    # like feedparser, no "id" key without a guid / id, so callers fall back to the link
+    if item_id:
+        entry["id"] = item_id
+    return entry
+
+def _rss_item(el):
+    content = _text(el.find(_CONTENT + "encoded"))
+    author = _text(el.find(_DC + "creator")) or _text(el.find("author"))
+    return _with_id(_text(el.find("guid")), {
+        "title": _text(el.find("title")),
+        "link": _text(el.find("link")),
+        "comments": _text(el.find("comments")),
+        "summary": _text(el.find("description")),
+        "content": [{"value": content}] if content else [],
+        "published": _text(el.find("pubDate")) or _text(el.find(_DC + "date")),
+        "authors": [{"name": author}] if author else [],
+    })
+
+def _atom_entry(el):
+    links = [dict(l.attrib) for l in el.iterfind(_ATOM + "link")]
+    content = _text(el.find(_ATOM + "content"))
+    return _with_id(_text(el.find(_ATOM + "id")), {
+        "title": _text(el.find(_ATOM + "title")),
+        "link": next(
+            (l["href"] for l in links if l.get("rel", "alternate") == "alternate" and l.get("href")), ""
+        ),
+        "summary": _text(el.find(_ATOM + "summary")) or content,
+        "content": [{"value": content}] if content else [],
+        "published": _text(el.find(_ATOM + "published")),
+        "updated": _text(el.find(_ATOM + "updated")),
+        "authors": [
+            {"name": a.findtext(_ATOM + "name") or ""} for a in el.iterfind(_ATOM + "author")
+        ],
+    })
+
+def feed_entries(content):
+    """
+    Entries of an RSS 2.0 / Atom document, with only the fields the sources read.
+    Each <item> / <entry> is cleared once copied. Dates stay raw strings for
+    utils.entry_published_dt. Bodies that aren't well-formed XML, or that hold no
+    RSS 2.0 item / Atom entry (e.g. RSS 1.0 / RDF), go to feedparser.
+    """
+    entries = []
+    try:
+        for _, el in ET.iterparse(BytesIO(content), events=("end",)):
+            if el.tag == "item":
+                entries.append(_rss_item(el))
+                el.clear()
+            elif el.tag == _ATOM + "entry":
+                entries.append(_atom_entry(el))
+                el.clear()
+    except ET.ParseError:
+        return _feedparser_entries(content)
+    return entries or _feedparser_entries(content)
@@ -0,0 +1,121 @@
+# sources/_http.py — shared keep-alive session, per-host pacing (token bucket), Retry-After backoff
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+UA = "AI-Research-Feed/1.0 (+https://example.com)"
+TIMEOUT_SECONDS = 30
+
+RETRY_STATUSES = (429, 503)
+MAX_RETRIES = 3
+BACKOFF_BASE_SECONDS = 2.0
+BACKOFF_CAP_SECONDS = 60.0
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: one token every `min_interval` seconds, holding at most
+    `burst` tokens. All threads hitting the same host share one bucket, so a pool of
+    workers cannot burst past the host's published rate.
+    """
+    def __init__(self, min_interval=0.0, burst=1):
+        self.min_interval = float(min_interval)
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._stamp = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    wait = self._blocked_until - now
+                elif self.min_interval <= 0:
+                    return
+                else:
+                    self._tokens = min(self.burst, self._tokens + (now - self._stamp) / self.min_interval)
+                    self._stamp = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) * self.min_interval
+            time.sleep(wait)
+
+    def pause(self, seconds):
+        """Hold every caller of this bucket for `seconds` (e.g. after a 429 / 503)."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+_BUCKETS = {}
+_BUCKETS_LOCK = threading.Lock()
+
+def limiter_for(url):
+    host = urlsplit(url).netloc.lower()
+    with _BUCKETS_LOCK:
+        bucket = _BUCKETS.get(host)
+        if bucket is None:
+            bucket = _BUCKETS[host] = TokenBucket()
+        return bucket
+
+def set_min_interval(url, seconds):
+    """Pace requests to url's host to at most one per `seconds`."""
+    bucket = limiter_for(url)
+    with bucket._lock:
+        bucket.min_interval = max(0.0, float(seconds))
+
+def retry_delay(headers, attempt):
+    """Seconds to wait before retry `attempt` (0-based): Retry-After if sent, else exponential."""
+    value = None
+    for k, v in (headers or {}).items():
+        if k.lower() == "retry-after":
+            value = (v or "").strip()
+            break
+    if value:
+        if value.isdigit():
+            return min(float(value), BACKOFF_CAP_SECONDS)
+        try:
+            when = parsedate_to_datetime(value)
+            return min(max(0.0, when.timestamp() - time.time()), BACKOFF_CAP_SECONDS)
+        except (TypeError, ValueError):
+            pass
+    return min(BACKOFF_BASE_SECONDS * (2 ** attempt), BACKOFF_CAP_SECONDS)
+
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
+
+def session():
+    """One pooled session per process so feed downloads reuse TCP/TLS connections."""
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            _SESSION = requests.Session()
+            _SESSION.headers.update({"User-Agent": UA, "Accept-Encoding": "gzip, deflate"})
+            adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16)
+            _SESSION.mount("http://", adapter)
+            _SESSION.mount("https://", adapter)
+        return _SESSION
+
+def get_feed(url, etag=None, modified=None, headers=None):
+    """
+    Paced, conditional GET of a feed URL. Returns the final Response (possibly a 304,
+    or a 429/503 once retries are exhausted); raises requests.RequestException on
+    network errors. `headers` are sent on top of the session's (e.g. a source's own UA).
+    """
+    headers = dict(headers or {})
+    if etag:
+        headers["If-None-Match"] = etag
+    if modified:
+        headers["If-Modified-Since"] = modified
+
+    bucket = limiter_for(url)
+    for attempt in range(MAX_RETRIES + 1):
+        bucket.acquire()
+        resp = session().get(url, headers=headers, timeout=TIMEOUT_SECONDS)
+        if resp.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+            return resp
+        bucket.pause(retry_delay(resp.headers, attempt))
@@ -1,48 +1,55 @@
-import feedparser
-from dateutil import parser as dateparser
-from datetime import timezone
-from utils import any_keyword_match, none_keyword_match, is_recent
+from concurrent.futures import ThreadPoolExecutor
+from sources import _http
+from sources._feed_cache import parse_entries
+from sources._feed_parse import feed_entries
+from utils import Entry, compile_keywords, entry_published_dt, is_after_cutoff, keyword_gate, lookback_cutoff
 
-def fetch(config, global_filters):
+def iter_fetch(config, global_filters):
     feeds = config.get("feeds", [])
     lookback_days = int(global_filters.get("lookback_days", 7))
+    cutoff_dt = lookback_cutoff(lookback_days)
     include_keywords = global_filters.get("include_keywords", [])
     exclude_keywords = global_filters.get("exclude_keywords", [])
+    include_re = compile_keywords(include_keywords)
+    exclude_re = compile_keywords(exclude_keywords)
 
-    entries = []
+    pause_seconds = float(config.get("request_pause_seconds", 0))
     for url in feeds:
-        feed = feedparser.parse(url)
-        for e in feed.entries:
-            published = e.get("published", e.get("updated", ""))
-            try:
-                published_dt = dateparser.parse(published).astimezone(timezone.utc)
-            except Exception:
-                published_dt = None
-
-            title = e.get("title","").strip()
-            summary = (e.get("summary","") or "").strip()
-            hay = f"{title}\n{summary}"
-
-            if not is_recent(published_dt, lookback_days):
-                continue
-            if include_keywords and not any_keyword_match(hay, include_keywords):
+        _http.set_min_interval(url, pause_seconds)
+
+    # Download all feeds concurrently; parse results in configured order.
+    with ThreadPoolExecutor(max_workers=max(1, len(feeds))) as pool:
+        parsed = list(pool.map(lambda u: parse_entries(u, parse=feed_entries), feeds))
+
+    for url, entries in zip(feeds, parsed):
+        for e in entries:
+            get = e.get
+            published_dt = entry_published_dt(e)
+            if not is_after_cutoff(published_dt, cutoff_dt):
                 continue
-            if not none_keyword_match(hay, exclude_keywords):
+
+            title = get("title","").strip()
+            summary = (get("summary","") or "").strip()
+            hay = f"{title}\n{summary}".lower()
+
+            if not keyword_gate(hay, include_re, exclude_re):
                 continue
 
-            link = e.get("link","")
-            authors = [{"name": a.get("name")} for a in e.get("authors", [])] if e.get("authors") else []
-
-            entries.append({
-                "id": e.get("id", link),
-                "title": title,
-                "summary": summary,
-                "authors": authors,
-                "published": published_dt,
-                "source": "ACL Anthology",
-                "category": url,
-                "tags": ["acl"],
-                "pdf": "",
-                "link": link,
-            })
-    return entries
+            link = get("link","")
+            authors = tuple({"name": a.get("name")} for a in get("authors") or ())
+
+            yield Entry(
+                id=get("id") or link,
+                title=title,
+                summary=summary,
+                authors=authors,
+                published=published_dt,
+                source="ACL Anthology",
+                category=url,
+                tags=("acl",),
+                pdf="",
+                link=link,
+            )
+
+def fetch(config, global_filters):
+    return list(iter_fetch(config, global_filters))
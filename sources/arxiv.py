@@ -1,23 +1,48 @@
 # sources/arxiv.py  — category-based (v3-compatible) + de-dupe + pagination + cutoff
-import calendar
 from datetime import datetime, timedelta, timezone
-from dateutil import parser as dateparser
-import feedparser
+from functools import lru_cache
+from io import BytesIO
 import re
 import time
-from utils import any_keyword_match, none_keyword_match, is_recent
+import xml.etree.ElementTree as ET
+from sources import _http
+from sources._feed_cache import parse_entries
+from utils import Entry, compile_keywords, entry_published_dt, is_recent, keyword_gate
 
 ARXIV_API = (
     "http://export.arxiv.org/api/query?"
-    "search_query=cat:{cat}&sortBy=submittedDate&sortOrder=descending&start={start}&max_results={page_size}"
+    "search_query={query}&sortBy=submittedDate&sortOrder=descending&start={start}&max_results={page_size}"
 )
+_VER_RE = re.compile(r"v\d+$")
+_ATOM = "{http://www.w3.org/2005/Atom}"
+_ARXIV = "{http://arxiv.org/schemas/atom}"
 
-def _to_datetime_utc(struct_time_obj):
-    """Convert feedparser's *_parsed to timezone-aware UTC datetime."""
-    if struct_time_obj is None:
-        return None
-    return datetime.fromtimestamp(calendar.timegm(struct_time_obj), tz=timezone.utc)
-
+def _search_query(categories, cutoff_dt):
+    """
+    (cat:A OR cat:B ...) — one query for the union, so a paper cross-listed in several
+    categories is downloaded once. Narrowed server-side to submissions since cutoff_dt
+    when one is set, so the last page ends at the cutoff.
+    """
+    query = "+OR+".join(f"cat:{c}" for c in categories)
+    if len(categories) > 1:
+        query = f"%28{query}%29"
+    if cutoff_dt is None:
+        return query
+    # Whole-day bounds keep the URL (and so its ETag cache row) stable for a day of
+    # runs; the exact cutoff is still applied per entry in _download.
+    end = datetime.now(timezone.utc)
+    return f"{query}+AND+submittedDate:[{cutoff_dt:%Y%m%d}0000+TO+{end:%Y%m%d}2359]"
+
+def _entry_category(entry, categories):
+    # First configured category the paper is listed in (config order wins);
+    # fall back to arXiv's primary category.
+    terms = {t.get("term") for t in entry.get("tags", []) if isinstance(t, dict)}
+    for c in categories:
+        if c in terms:
+            return c
+    return (entry.get("arxiv_primary_category") or {}).get("term", "")
+
+@lru_cache(maxsize=8192)
 def _norm_arxiv_id(raw_id: str) -> str:
     """
     arXiv ids may look like 'http://arxiv.org/abs/2401.01234v2'.
@@ -26,34 +51,110 @@ def _norm_arxiv_id(raw_id: str) -> str:
     if not raw_id:
         return ""
     last = raw_id.rstrip("/").rsplit("/", 1)[-1]
-    return re.sub(r"v\d+$", "", last)
+    return _VER_RE.sub("", last)
 
 def _pick_pdf_link(entry) -> str:
-    # Prefer the explicit PDF link if present
-    for link in entry.get("links", []):
-        href = link.get("href")
-        title = (link.get("title") or "").lower()
-        if href and ("pdf" in href or title == "pdf"):
-            return href
-    # Fallback to main link
-    return entry.get("link", "")
-
-def _entry_published_dt(entry):
-    # Use 'published' (initial submission) as submittedDate proxy; fallback to updated
-    published = entry.get("published", entry.get("updated", ""))
+    # Prefer the explicit PDF link (arXiv: rel="related" type="application/pdf" title="pdf");
+    # fallback to main link
+    return next(
+        (
+            link["href"]
+            for link in entry.get("links", [])
+            if link.get("href") and (link.get("type") == "application/pdf" or link.get("title") == "pdf")
+        ),
+        entry.get("link", ""),
+    )
+
+def _entry_dict(el):
+    """The fields fetch() reads from an Atom <entry>, shaped like feedparser's entry."""
+    def text(tag):
+        return el.findtext(tag) or ""
+
+    links = [dict(l.attrib) for l in el.iterfind(_ATOM + "link")]
+    entry = {
+        "id": text(_ATOM + "id"),
+        "title": text(_ATOM + "title"),
+        "summary": text(_ATOM + "summary"),
+        "published": text(_ATOM + "published"),
+        "updated": text(_ATOM + "updated"),
+        "authors": [{"name": a.findtext(_ATOM + "name") or ""} for a in el.iterfind(_ATOM + "author")],
+        "tags": [{"term": c.get("term")} for c in el.iterfind(_ATOM + "category")],
+        "links": links,
+        "link": next((l["href"] for l in links if l.get("rel") == "alternate" and l.get("href")), ""),
+    }
+    primary = el.find(_ARXIV + "primary_category")
+    if primary is not None:
+        entry["arxiv_primary_category"] = {"term": primary.get("term")}
     try:
-        return dateparser.parse(published).astimezone(timezone.utc)
-    except Exception:
-        return None
+        entry["published_parsed"] = time.strptime(entry["published"], "%Y-%m-%dT%H:%M:%SZ")
+    except ValueError:
+        pass  # entry_published_dt falls back to the raw string
+    return entry
 
-def fetch(config, global_filters):
+def _parse_feed(content):
+    """
+    Stream an API page with iterparse, keeping only the fields fetch() uses instead of
+    building feedparser's full per-entry tree. Each <entry> is cleared once copied.
+    """
+    entries = []
+    try:
+        for _, el in ET.iterparse(BytesIO(content), events=("end",)):
+            if el.tag == _ATOM + "entry":
+                entries.append(_entry_dict(el))
+                el.clear()
+    except ET.ParseError:
+        pass  # truncated / non-XML body: keep what parsed, like feedparser's bozo mode
+    return entries
+
+def _download(query, page_size, cutoff_dt, max_pages):
+    """
+    Page through a query (newest first) and return [(entry, published_dt), ...],
+    stopping at the cutoff / page limits. No filtering beyond the cutoff happens here.
+    """
+    out = []
+    start = 0
+    pages = 0
+
+    while True:
+        url = ARXIV_API.format(query=query, start=start, page_size=page_size)
+        entries = parse_entries(url, parse=_parse_feed)
+        if not entries:
+            break
+
+        stop_paging = False
+        for e in entries:
+            published_dt = entry_published_dt(e)  # "published" (v1 submission) ~ submittedDate
+
+            # If a cutoff is defined and this entry is older, we can stop (sorted descending).
+            if cutoff_dt and published_dt and published_dt < cutoff_dt:
+                stop_paging = True
+                break
+            out.append((e, published_dt))
+
+        if stop_paging:
+            break
+
+        # If fewer than a full page returned, we've exhausted results
+        if len(entries) < page_size:
+            break
+
+        # Advance pagination
+        start += page_size
+        pages += 1
+        if pages >= max_pages:
+            break
+
+    return out
+
+def iter_fetch(config, global_filters):
     """
     Config options (all optional):
       - categories: list[str] (default: ["cs.AI","cs.LG","cs.CL","cs.CR"])
       - max_results_per_category: int page size per request (default: 100, hard max API is 2000)
       - fetch_all: bool, paginate until exhaustion if True (default: False unless a cutoff is supplied)
       - max_pages_per_category: int safety cap while paginating (default: 1000)
-      - request_pause_seconds: float polite delay between pages (default: 3.0)
+      - request_pause_seconds: float minimum gap between any two arXiv API requests
+        (default: 3.0, arXiv's published limit)
 
     Global filters (all optional):
       - lookback_hours: int -> define cutoff; stop paging once entries are older than this
@@ -72,7 +173,9 @@ def fetch(config, global_filters):
 
     include_keywords = global_filters.get("include_keywords", [])
     exclude_keywords = global_filters.get("exclude_keywords", [])
-    priority_authors = [a.lower() for a in global_filters.get("priority_authors", [])]
+    priority_authors = frozenset(a.lower() for a in global_filters.get("priority_authors", []))
+    include_re = compile_keywords(include_keywords)
+    exclude_re = compile_keywords(exclude_keywords)
 
     # Determine a cutoff datetime in UTC if provided
     cutoff_dt = None
@@ -82,90 +185,65 @@ def fetch(config, global_filters):
         # Keep support for the legacy days-based option
         cutoff_dt = datetime.now(timezone.utc) - timedelta(days=int(global_filters["lookback_days"]))
 
-    all_entries = []
-    seen_ids = set()  # normalized arXiv ids across categories
-
-    for cat in categories:
-        start = 0
-        pages = 0
-        stop_paging = False
-
-        while True:
-            url = ARXIV_API.format(cat=cat, start=start, page_size=page_size)
-            feed = feedparser.parse(url)
-            entries = feed.entries or []
-            if not entries:
-                break
-
-            for e in entries:
-                published_dt = _entry_published_dt(e)
-
-                # If a cutoff is defined and this entry is older, we can stop (sorted descending).
-                if cutoff_dt and published_dt and published_dt < cutoff_dt:
-                    stop_paging = True
-                    break
-
-                # If there's no explicit cutoff but a legacy days filter was provided in the past,
-                # keep honoring it via is_recent() (this is redundant when cutoff_dt is set).
-                if cutoff_dt is None and "lookback_days" in global_filters:
-                    if not is_recent(published_dt, int(global_filters["lookback_days"])):
-                        continue
-
-                # Normalize id and drop duplicates across categories
-                raw_id = e.get("id", "") or e.get("link", "")
-                nid = _norm_arxiv_id(raw_id)
-                if nid in seen_ids:
-                    continue
-                seen_ids.add(nid)
-
-                # Extract content
-                title = (e.get("title", "") or "").strip()
-                summary = (e.get("summary", "") or "").strip()
-                hay = f"{title}\n{summary}"
-
-                authors = e.get("authors", [])
-                author_names = [a.get("name", "").lower() for a in authors]
-                author_priority = any(a in priority_authors for a in author_names) if priority_authors else False
-
-                include_ok = any_keyword_match(hay, include_keywords) if include_keywords else True
-                exclude_ok = none_keyword_match(hay, exclude_keywords)
-
-                if not (include_ok or author_priority):
-                    continue
-                if not exclude_ok:
-                    continue
-
-                tags = [t.get("term") for t in e.get("tags", []) if isinstance(t, dict) and t.get("term")]
-
-                all_entries.append({
-                    "id": nid,                         # normalized id without version
-                    "title": title,
-                    "summary": summary,
-                    "authors": authors,
-                    "published": published_dt,
-                    "source": "arXiv",
-                    "category": cat,
-                    "tags": tags,
-                    "pdf": _pick_pdf_link(e),
-                    "link": e.get("link", ""),
-                })
-
-            if stop_paging:
-                break
-
-            # If fewer than a full page returned, we've exhausted results
-            if len(entries) < page_size:
-                break
-
-            # If no cutoff and not explicitly fetching all, preserve legacy single-page behavior
-            if cutoff_dt is None and not fetch_all:
-                break
-
-            # Advance pagination
-            start += page_size
-            pages += 1
-            if pages >= max_pages:
-                break
-            time.sleep(pause_seconds)  # be polite to arXiv
+    if not categories:
+        return
+
+    seen_ids = set()  # normalized arXiv ids (a paper can still repeat across pages)
+
+    # One query for the union of categories; requests are paced by the token bucket
+    # for export.arxiv.org. The page budget stays max_results_per_category per
+    # category: one page each in legacy single-page mode, else max_pages each.
+    _http.set_min_interval(ARXIV_API, pause_seconds)
+    if cutoff_dt is None and not fetch_all:
+        page_budget = len(categories)
+    else:
+        page_budget = max_pages * len(categories)
+    downloaded = _download(_search_query(categories, cutoff_dt), page_size, cutoff_dt, max(1, page_budget))
+
+    for e, published_dt in downloaded:
+        get = e.get
+        # Normalize id and drop duplicates first (pages can shift while paging), so a
+        # repeat costs nothing beyond the id lookup.
+        raw_id = get("id", "") or get("link", "")
+        nid = _norm_arxiv_id(raw_id)
+        if nid in seen_ids:
+            continue
+        seen_ids.add(nid)
+
+        # If there's no explicit cutoff but a legacy days filter was provided in the past,
+        # keep honoring it via is_recent() (this is redundant when cutoff_dt is set).
+        if cutoff_dt is None and "lookback_days" in global_filters:
+            if not is_recent(published_dt, int(global_filters["lookback_days"])):
+                continue
+
+        # Extract content
+        title = (get("title", "") or "").strip()
+        summary = (get("summary", "") or "").strip()
+        hay = f"{title}\n{summary}".lower()
+
+        authors = tuple(get("authors") or ())
+
+        # Priority authors only rescue an include miss, never an exclude hit.
+        if not keyword_gate(hay, include_re, exclude_re):
+            if (exclude_re and exclude_re.search(hay)) or not (priority_authors and any(
+                a.get("name", "").lower() in priority_authors for a in authors
+            )):
+                continue
+
+        tags = tuple(t.get("term") for t in get("tags", []) if isinstance(t, dict) and t.get("term"))
+
+        yield Entry(
+            id=nid,                         # normalized id without version
+            title=title,
+            summary=summary,
+            authors=authors,
+            published=published_dt,
+            source="arXiv",
+            category=_entry_category(e, categories),
+            tags=tags,
+            pdf=_pick_pdf_link(e),
+            link=get("link", ""),
+        )
 
-    return all_entries
+def fetch(config, global_filters):
+    return list(iter_fetch(config, global_filters))
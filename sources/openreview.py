@@ -1,7 +1,8 @@
 # sources/openreview.py — API v2
+from concurrent.futures import ThreadPoolExecutor
 import openreview
-from datetime import datetime, timezone, timedelta
-from utils import any_keyword_match, none_keyword_match, is_recent
+from datetime import datetime, timezone
+from utils import Entry, compile_keywords, keyword_gate, lookback_cutoff
 
 def _effective_keywords(config, global_filters, key):
     if key in config:
@@ -31,58 +32,108 @@ def get_first_content_text(content: dict, *keys: str) -> str:
             return _as_text(content[k])
     return ""
 
-def fetch(config, global_filters):
+PAGE_SIZE = 1000  # API v2 max per request
+BASEURL = "https://api2.openreview.net"
+_CLIENT = None
+
+def _client():
+    # One client (and its HTTP session) per process, reused across fetch() calls
+    # such as Streamlit reruns.
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = openreview.api.OpenReviewClient(baseurl=BASEURL)
+    return _CLIENT
+
+def _note_ts(n):
+    # times: prefer tmdate (ms) if present; fall back to cdate
+    return getattr(n, "tmdate", None) or getattr(n, "mdate", None) or getattr(n, "cdate", None)
+
+def _recent_notes(client, venue, cutoff_ms):
+    """
+    Notes for a venue, newest tmdate first. The API only offers mintcdate (creation
+    time), not a modification-time filter, so page with get_notes and stop at the first
+    page that reaches past the cutoff instead of get_all_notes' whole-venue download.
+    With no cutoff (cutoff_ms None) page until get_notes returns a short page.
+    """
+    notes, offset = [], 0
+    while True:
+        page = client.get_notes(
+            content={"venue": venue},
+            sort="tmdate:desc",
+            limit=PAGE_SIZE,
+            offset=offset,
+        )
+        notes.extend(page)
+        if len(page) < PAGE_SIZE:
+            return notes
+        last_ts = _note_ts(page[-1])
+        if cutoff_ms is not None and last_ts and last_ts < cutoff_ms:
+            return notes
+        offset += len(page)
+
+def iter_fetch(config, global_filters):
     venues = config.get("venues", [])
     limit = int(config.get("limit_per_venue", 75))
     lookback_days = int(config.get("lookback_days", global_filters.get("lookback_days", 7)))
     include_keywords = _effective_keywords(config, global_filters, "include_keywords")
     exclude_keywords = _effective_keywords(config, global_filters, "exclude_keywords")
+    include_re = compile_keywords(include_keywords)
+    exclude_re = compile_keywords(exclude_keywords)
+
+    # None when lookback_days <= 0 (no limit): every note is kept
+    cutoff_dt = lookback_cutoff(lookback_days)
+    cutoff_ms = int(cutoff_dt.timestamp() * 1000) if cutoff_dt else None
 
-    client = openreview.api.OpenReviewClient(baseurl="https://api2.openreview.net")
+    client = _client()
 
-    out = []
-    for venue in venues:
+    def _fetch_venue(venue):
         try:
-            notes = client.get_all_notes(
-                content={"venue": venue},
-                sort="tmdate:desc",
-            )
+            return _recent_notes(client, venue, cutoff_ms)
         except Exception:
+            return None
+
+    # Query venues concurrently; filter in configured order.
+    workers = max(1, min(int(config.get("concurrency", 4)), len(venues)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        downloaded = list(pool.map(_fetch_venue, venues))
+
+    for venue, notes in zip(venues, downloaded):
+        if notes is None:
             continue
 
         for n in notes:
-            # times: prefer tmdate (ms) if present; fall back to cdate
-            ts = getattr(n, "tmdate", None) or getattr(n, "mdate", None) or getattr(n, "cdate", None)
+            ts = _note_ts(n)
+            # sorted by tmdate desc: every note after the first stale one is stale too
+            if cutoff_ms is not None and ts and ts < cutoff_ms:
+                break
             published_dt = datetime.fromtimestamp(ts/1000, tz=timezone.utc) if ts else None
-            if not is_recent(published_dt, 1):
-                continue
 
             title = (n.content.get("title").get("value") or "")
             abstract = get_first_content_text(
                 n.content,
                 "abstract", "Abstract", "tl;dr", "TL;DR", "summary", "Summary"
             )
-            hay = f"{title}\n{abstract}"
-            if include_keywords and not any_keyword_match(hay, include_keywords):
-                continue
-            if not none_keyword_match(hay, exclude_keywords):
+            hay = f"{title}\n{abstract}".lower()
+            if not keyword_gate(hay, include_re, exclude_re):
                 continue
 
-            authors = [{"name": a} for a in (n.content.get("authors") or [])]
+            authors = tuple({"name": a} for a in (n.content.get("authors") or ()))
             forum = n.forum or n.id
             link = f"https://openreview.net/forum?id={forum}"
             #html_link = n.content.get("html").get("value")
             
-            out.append({
-                "id": n.id,
-                "title": title,
-                "summary": abstract,
-                "authors": authors,
-                "published": published_dt,
-                "source": "OpenReview",
-                "category": "ICLR 2025",
-                "tags": ["openreview"],
-                "pdf": "",   # Optional: use client.get_pdf(n.id) if you need the binary
-                "link": link,
-            })
-    return out
+            yield Entry(
+                id=n.id,
+                title=title,
+                summary=abstract,
+                authors=authors,
+                published=published_dt,
+                source="OpenReview",
+                category="ICLR 2025",
+                tags=("openreview",),
+                pdf="",   # Optional: use client.get_pdf(n.id) if you need the binary
+                link=link,
+            )
+
+def fetch(config, global_filters):
+    return list(iter_fetch(config, global_filters))
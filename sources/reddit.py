@@ -1,7 +1,12 @@
-import requests
-from dateutil import parser as dateparser
-from datetime import timezone
-from utils import any_keyword_match, none_keyword_match, is_recent
+from concurrent.futures import ThreadPoolExecutor
+import time
+from datetime import datetime, timezone
+try:
+    import orjson as _json  # optional, faster decode of large listings
+except ImportError:
+    import json as _json
+from sources._feed_cache import parse_entries
+from utils import Entry, compile_keywords, keyword_gate
 
 def _effective_keywords(config, global_filters, key):
     # If source sets include/exclude explicitly (even []), use that; else fall back to global
@@ -9,68 +14,101 @@ def _effective_keywords(config, global_filters, key):
         return config.get(key) or []
     return global_filters.get(key, []) or []
  
-API = "https://www.reddit.com/r/{sub}/new.json?limit={limit}"  # unauth max ~100
+API = "https://www.reddit.com/r/{sub}/new.json?limit={limit}"  # unauth max 100 per request
+# Use a specific UA; Reddit may throttle generic UAs.
+HEADERS = {"User-Agent": "AI-Research-Feed/1.0 (contact: youremail@example.com)"}
 
-def fetch(config, global_filters):
+def _listing_children(content):
+    try:
+        data = _json.loads(content).get("data", {}) or {}
+    except ValueError:
+        return []
+    return data.get("children", []) or []
+
+def _fetch_sub(sub, limit, cutoff_ts):
+    """
+    Newest posts of a subreddit (listing children), up to `limit`. Pages go through the
+    ETag / Last-Modified cache, so an unchanged listing is a 304 replay. Follows the
+    `after` cursor past the 100-per-request cap and stops paging once a page reaches
+    posts older than cutoff_ts.
+    """
+    children, after = [], None
+    while len(children) < limit:
+        page_size = min(100, limit - len(children))
+        url = API.format(sub=sub, limit=page_size)
+        if after:
+            url += f"&after={after}"
+        page = parse_entries(url, parse=_listing_children, headers=HEADERS)
+        if not page:
+            break
+        children.extend(page)
+        # a listing's `after` cursor is the fullname (t3_...) of its last post
+        after = (page[-1].get("data", {}) or {}).get("name")
+        if not after or len(page) < page_size:
+            break
+        last_created = (page[-1].get("data", {}) or {}).get("created_utc")
+        if cutoff_ts and last_created and float(last_created) < cutoff_ts:
+            break
+    return children
+
+def iter_fetch(config, global_filters):
     subs = config.get("subreddits", [])
     lookback_days = int(global_filters.get("lookback_days", 7))
     include_keywords = _effective_keywords(config, global_filters, "include_keywords")
     exclude_keywords = _effective_keywords(config, global_filters, "exclude_keywords")
+    include_re = compile_keywords(include_keywords)
+    exclude_re = compile_keywords(exclude_keywords)
     preview_chars = int(config.get("preview_chars", 300))
     per_sub_limit = int(config.get("max_results_per_subreddit", 100))
 
-    # Use a specific UA; Reddit may throttle generic UAs.
-    headers = {"User-Agent": "AI-Research-Feed/1.0 (contact: youremail@example.com)"}
-    out = []
+    cutoff_ts = time.time() - lookback_days * 86400 if lookback_days > 0 else None
 
-    for s in subs:
-        url = API.format(sub=s, limit=min(100, per_sub_limit))
-        try:
-            r = requests.get(url, headers=headers, timeout=20)
-            r.raise_for_status()
-            data = r.json()
-        except Exception:
-            continue
+    # Subreddits are fetched concurrently; results merged in configured order.
+    workers = max(1, min(int(config.get("concurrency", 4)), len(subs)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        downloaded = list(pool.map(lambda s: _fetch_sub(s, per_sub_limit, cutoff_ts), subs))
 
-        for child in (data.get("data", {}) or {}).get("children", []):
+    for s, children in zip(subs, downloaded):
+        for child in children:
             d = child.get("data", {}) or {}
-            title = (d.get("title") or "").strip()
-            selftext = (d.get("selftext") or "").strip()
-            link = "https://www.reddit.com" + d.get("permalink","")
-            created_utc = d.get("created_utc")
-            published_dt = None
-            if created_utc:
-                try:
-                    from datetime import datetime, timezone
-                    published_dt = datetime.fromtimestamp(float(created_utc), tz=timezone.utc)
-                except Exception:
-                    pass
-
-            # lookback + keyword filters
-            hay = f"{title}\n{selftext}"
-            if not is_recent(published_dt, lookback_days):
-                continue
-            if include_keywords and not any_keyword_match(hay, include_keywords):
+            get = d.get
+            # lookback on the raw epoch seconds; datetimes are only built for kept posts
+            try:
+                created = float(get("created_utc") or 0) or None
+            except (TypeError, ValueError):
+                created = None
+            if created and cutoff_ts and created < cutoff_ts:
                 continue
-            if not none_keyword_match(hay, exclude_keywords):
+            published_dt = datetime.fromtimestamp(created, tz=timezone.utc) if created else None
+
+            title = (get("title") or "").strip()
+            selftext = (get("selftext") or "").strip()
+            link = "https://www.reddit.com" + get("permalink","")
+
+            # keyword filters
+            hay = f"{title}\n{selftext}".lower()
+            if not keyword_gate(hay, include_re, exclude_re):
                 continue
 
             # preview
             text = (selftext or "").replace("\r"," ").replace("\n"," ")
             if len(text) > preview_chars:
-                text = text[:preview_chars].rsplit(" ",1)[0] + "…"
+                cut = text.rfind(" ", 0, preview_chars)
+                text = (text[:cut] if cut > 0 else text[:preview_chars]) + "…"
 
-            out.append({
-                "id": d.get("id", link),
-                "title": f"[r/{s}] {title}",
-                "summary": text,
-                "fulltext": selftext,
-                "authors": [{"name": d.get("author")}],
-                "published": published_dt,
-                "source": "Reddit",
-                "category": s,
-                "tags": ["reddit"],
-                "pdf": "",
-                "link": link,
-            })
-    return out
+            yield Entry(
+                id=get("id", link),
+                title=f"[r/{s}] {title}",
+                summary=text,
+                fulltext=selftext,
+                authors=({"name": get("author")},),
+                published=published_dt,
+                source="Reddit",
+                category=s,
+                tags=("reddit",),
+                pdf="",
+                link=link,
+            )
+
+def fetch(config, global_filters):
+    return list(iter_fetch(config, global_filters))
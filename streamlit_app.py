@@ -1,9 +1,12 @@
 #!/usr/bin/env python3
 # streamlit_app.py
 
+import hashlib
+import json
 import os
-import io
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from operator import attrgetter
 import streamlit as st
 
 # Local imports from your project
@@ -18,6 +21,18 @@ from sources import hackernoon as src_hackernoon
 from digest_helpers import build_digest, has_email_credentials, get_secret
 from daily_digest import load_config
 
+# (config key, bucket name, module) in display order
+SOURCES = (
+    ("arxiv", "arXiv", src_arxiv),
+    ("openreview", "OpenReview", src_openreview),
+    ("acl", "ACL Anthology", src_acl),
+    ("reddit", "Reddit", src_reddit),
+    ("hn", "Hacker News", src_hn),
+    ("hackernoon", "Hackernoon", src_hackernoon),
+)
+VIEW_OPTIONS = ["All"] + [name for _, name, _ in SOURCES]
+PAGE_SIZE = 25  # entries rendered per "Load more" step
+
 
 # ---------------------------
 # Page config
@@ -29,12 +44,22 @@ st.set_page_config(page_title="AI & AI Security — Morning Feed", layout="wide"
 # ---------------------------
 CONFIG_PATH = os.path.join(os.path.dirname(__file__), "config.yaml")
 CFG = load_config(CONFIG_PATH)
-
-ui_cfg = CFG.get("ui", {}) or {}
-default_source = ui_cfg.get("default_source", "All")
-show_abstract_default_default = bool(ui_cfg.get("show_abstract_default", True))
 sources_cfg = CFG.get("sources", {}) or {}
 
+@st.cache_data(show_spinner=False)
+def _derive_ui(cfg_mtime, _cfg):
+    # Widget defaults from config.yaml, recomputed only when the file changes on disk.
+    ui_cfg = _cfg.get("ui", {}) or {}
+    src_cfg = _cfg.get("sources", {}) or {}
+    return {
+        "default_source": ui_cfg.get("default_source", "All"),
+        "show_abstract_default": bool(ui_cfg.get("show_abstract_default", True)),
+        "enabled": {key: bool((src_cfg.get(key) or {}).get("enabled", True)) for key, _, _ in SOURCES},
+        "subreddits": list((src_cfg.get("reddit") or {}).get("subreddits", [])),
+    }
+
+UI = _derive_ui(os.path.getmtime(CONFIG_PATH), CFG)
+
 # ---------------------------
 # Session state defaults
 # ---------------------------
@@ -46,13 +71,15 @@ if "global_filters" not in st.session_state:
         "priority_authors": [a.lower() for a in CFG.get("priority_authors", [])],
     }
 if "show_abstract_default" not in st.session_state:
-    st.session_state.show_abstract_default = show_abstract_default_default
+    st.session_state.show_abstract_default = UI["show_abstract_default"]
 if "source_choice" not in st.session_state:
-    st.session_state.source_choice = default_source
-if "last_fetch_key" not in st.session_state:
-    st.session_state.last_fetch_key = 0
+    st.session_state.source_choice = UI["default_source"]
 if "selected_subreddit" not in st.session_state:
     st.session_state.selected_subreddit = "All"
+if "page" not in st.session_state:
+    st.session_state.page = 1
+if "last_fetch_key" not in st.session_state:
+    st.session_state.last_fetch_key = 0
 
 # ---------------------------
 # Sidebar
@@ -82,20 +109,17 @@ with st.sidebar:
 
         st.markdown("---")
         st.header("Sources")
-        enabled = {}
-        for key in ["arxiv", "openreview", "acl", "reddit", "hn", "hackernoon"]:
-            src_conf = sources_cfg.get(key, {})
-            enabled[key] = st.checkbox(
-                f"Enable {key}",
-                value=bool(src_conf.get("enabled", True)),
-            )
+        enabled = {
+            key: st.checkbox(f"Enable {key}", value=default)
+            for key, default in UI["enabled"].items()
+        }
 
         st.markdown("---")
         source_choice = st.selectbox(
             "View",
-            options=["All", "arXiv", "OpenReview", "ACL Anthology", "Reddit", "Hacker News", "Hackernoon"],
-            index=["All", "arXiv", "OpenReview", "ACL Anthology", "Reddit", "Hacker News", "Hackernoon"].index(
-                st.session_state.source_choice if st.session_state.source_choice in ["All","arXiv","OpenReview","ACL Anthology","Reddit","Hacker News","Hackernoon"] else "All"
+            options=VIEW_OPTIONS,
+            index=VIEW_OPTIONS.index(
+                st.session_state.source_choice if st.session_state.source_choice in VIEW_OPTIONS else "All"
             ),
         )
 
@@ -110,7 +134,7 @@ with st.sidebar:
         }
         st.session_state.show_abstract_default = show_abs
         st.session_state.source_choice = source_choice
-        st.session_state.last_fetch_key += 1
+        st.session_state.last_fetch_key += 1  # "Update" always refetches, even with unchanged filters
 
     # ---------------------------
     # Email section
@@ -187,61 +211,60 @@ with st.sidebar:
 # ---------------------------
 # Fetching data
 # ---------------------------
-@st.cache_data(show_spinner=True)
-def fetch_all(_sources_cfg, _global_filters, _enabled, _nonce):
-    results = []
-    buckets = {"arXiv": [], "OpenReview": [], "ACL Anthology": [], "Reddit": [], "Hacker News": [], "Hackernoon": []}
-
-    if _enabled.get("arxiv", True):
-        buckets["arXiv"] = src_arxiv.fetch(_sources_cfg.get("arxiv", {}), _global_filters)
-        results.extend(buckets["arXiv"])
-    if _enabled.get("openreview", True):
-        buckets["OpenReview"] = src_openreview.fetch(_sources_cfg.get("openreview", {}), _global_filters)
-        results.extend(buckets["OpenReview"])
-    if _enabled.get("acl", True):
-        buckets["ACL Anthology"] = src_acl.fetch(_sources_cfg.get("acl", {}), _global_filters)
-        results.extend(buckets["ACL Anthology"])
-    if _enabled.get("reddit", True):
-        buckets["Reddit"] = src_reddit.fetch(_sources_cfg.get("reddit", {}), _global_filters)
-        results.extend(buckets["Reddit"])
-    if _enabled.get("hn", True):
-        buckets["Hacker News"] = src_hn.fetch(_sources_cfg.get("hn", {}), _global_filters)
-        results.extend(buckets["Hacker News"])
-    if _enabled.get("hackernoon", True):
-        buckets["Hackernoon"] = src_hackernoon.fetch(_sources_cfg.get("hackernoon", {}), _global_filters)
-        results.extend(buckets["Hackernoon"])
-
+def _digest(obj):
+    return hashlib.blake2b(json.dumps(obj, sort_keys=True, default=str).encode("utf-8"), digest_size=16).hexdigest()
+
+@st.cache_data(ttl=300, show_spinner=False)
+def fetch_source(key, cfg_hash, filters_hash, fetch_key, _cfg, _global_filters):
+    # Cached per source on small digests of its inputs (the dicts themselves are not
+    # hashed), so changing one source's settings or toggling it leaves the others cached.
+    # fetch_key is bumped by "Update" to force a refetch.
+    module = next(mod for k, _, mod in SOURCES if k == key)
+    return module.fetch(_cfg, _global_filters)
+
+def fetch_all(_sources_cfg, _global_filters, _enabled, fetch_key):
+    buckets = {name: [] for _, name, _ in SOURCES}
+    filters_hash = _digest(_global_filters)
+
+    # Every source talks to a different host, so fetch them concurrently.
+    tasks = [(key, name, _sources_cfg.get(key, {})) for key, name, _ in SOURCES if _enabled.get(key, True)]
+    if tasks:
+        with ThreadPoolExecutor(max_workers=len(tasks)) as pool:
+            futures = {
+                pool.submit(fetch_source, key, _digest(cfg), filters_hash, fetch_key, cfg, _global_filters): name
+                for key, name, cfg in tasks
+            }
+            for fut in as_completed(futures):
+                buckets[futures[fut]] = fut.result()
     for k, v in buckets.items():
         print(f"[debug] {k}: {len(v)} items", flush=True)
 
-    seen = set()
+    # Each bucket holds exactly one source, so de-duping ids per bucket is the same as
+    # de-duping (source, id) pairs, without building a tuple per entry.
     deduped = []
-    for en in results:
-        key = (en.get("source"), en.get("id"))
-        if key in seen:
-            continue
-        seen.add(key)
-        deduped.append(en)
-
-    deduped.sort(key=lambda x: x.get("published") or datetime.min, reverse=True)
+    for items in buckets.values():  # display order
+        seen = set()
+        for en in items:
+            if en.id in seen:
+                continue
+            seen.add(en.id)
+            deduped.append(en)
+
+    deduped.sort(key=attrgetter("ts"), reverse=True)
     return buckets, deduped
 
+
 # ---------------------------
-# Tabs
+# Feed view
 # ---------------------------
-tab_feed, tab_help = st.tabs(["Feed", "Help"])
-
-with tab_feed:
-    buckets, all_entries = fetch_all(
-        sources_cfg, st.session_state.global_filters, enabled, st.session_state.last_fetch_key
-    )
-
+@st.fragment
+def render_feed(buckets, all_entries):
+    # Subreddit picks and "Load more" rerun only this block, not the fetch above it.
     source_choice = st.session_state.source_choice
     entries = all_entries if source_choice == "All" else buckets.get(source_choice, [])
 
     if source_choice == "Reddit":
-        subs = sources_cfg.get("reddit", {}).get("subreddits", [])
-        sr_options = ["All"] + subs
+        sr_options = ["All"] + UI["subreddits"]
         if st.session_state.selected_subreddit not in sr_options:
             st.session_state.selected_subreddit = "All"
         sr = st.selectbox(
@@ -252,30 +275,28 @@ with tab_feed:
         if sr != st.session_state.selected_subreddit:
             st.session_state.selected_subreddit = sr
         if sr != "All":
-            entries = [e for e in entries if e.get("category") == sr]
+            entries = [e for e in entries if e.category == sr]
 
     st.subheader(f"{source_choice} — {len(entries)} items")
 
     def to_markdown(entries_list):
-        out = io.StringIO()
-        out.write(f"# AI & AI Security Feed ({datetime.now():%Y-%m-%d %H:%M})\n\n")
+        # one formatted chunk per entry, joined once at the end
+        parts = [f"# AI & AI Security Feed ({datetime.now():%Y-%m-%d %H:%M})\n\n"]
+        append = parts.append
         for i, en in enumerate(entries_list, 1):
-            authors = format_authors(en.get("authors"))
-            date_s = en["published"].strftime("%Y-%m-%d") if en.get("published") else ""
-            out.write(f"## {i}. {en['title']}\n")
-            out.write(f"- **Date:** {date_s}\n")
-            out.write(f"- **Authors:** {authors}\n")
-            out.write(f"- **Source:** {en.get('source','')}\n")
-            if en.get("category"):
-                out.write(f"- **Category:** {en['category']}\n")
-            if en.get("tags"):
-                out.write(f"- **Tags:** {', '.join(en['tags'])}\n")
-            if en.get("pdf"):
-                out.write(f"- **PDF:** {en['pdf']}\n")
-            out.write(f"- **Link:** {en.get('link','')}\n\n")
-            if en.get("summary"):
-                out.write(f"> {en['summary']}\n\n")
-        return out.getvalue().encode("utf-8")
+            date_s = en.published.strftime("%Y-%m-%d") if en.published else ""
+            append(
+                f"## {i}. {en.title}\n"
+                f"- **Date:** {date_s}\n"
+                f"- **Authors:** {format_authors(en.authors)}\n"
+                f"- **Source:** {en.source}\n"
+                + (f"- **Category:** {en.category}\n" if en.category else "")
+                + (f"- **Tags:** {', '.join(en.tags)}\n" if en.tags else "")
+                + (f"- **PDF:** {en.pdf}\n" if en.pdf else "")
+                + f"- **Link:** {en.link}\n\n"
+                + (f"> {en.summary}\n\n" if en.summary else "")
+            )
+        return "".join(parts).encode("utf-8")
 
     st.download_button(
         "⬇️ Download as Markdown",
@@ -285,22 +306,22 @@ with tab_feed:
     )
 
     def render_entry(en, idx):
-        date_s = en["published"].strftime("%Y-%m-%d") if en.get("published") else ""
+        date_s = en.published.strftime("%Y-%m-%d") if en.published else ""
         with st.container(border=True):
-            st.markdown(f"**{idx}. {en['title']}**  \n*{date_s}* — _{en.get('source','')}_")
-            if en.get("authors"):
-                st.markdown(f"_Authors:_ {format_authors(en['authors'])}")
-            if st.session_state.show_abstract_default and en.get("summary"):
-                st.write(en["summary"])
-            if en.get("fulltext"):
+            st.markdown(f"**{idx}. {en.title}**  \n*{date_s}* — _{en.source}_")
+            if en.authors:
+                st.markdown(f"_Authors:_ {format_authors(en.authors)}")
+            if st.session_state.show_abstract_default and en.summary:
+                st.write(en.summary)
+            if en.fulltext:
                 with st.expander("Show full post text"):
-                    st.write(en["fulltext"])
-            elif en.get("summary"):
+                    st.write(en.fulltext)
+            elif en.summary:
                 with st.expander("Abstract" if not st.session_state.show_abstract_default else "Hide abstract"):
-                    st.write(en["summary"])
+                    st.write(en.summary)
             cols = st.columns(3)
-            link = en.get("link", "")
-            pdf = en.get("pdf", "")
+            link = en.link
+            pdf = en.pdf
             with cols[0]:
                 if pdf:
                     st.link_button("Open PDF", pdf)
@@ -308,10 +329,32 @@ with tab_feed:
                 if link:
                     st.link_button("Source Page", link)
             with cols[2]:
-                st.write(f"**Category:** {en.get('category','')}")
-
-    for i, en in enumerate(entries, 1):
+                st.write(f"**Category:** {en.category}")
+
+    # Only the first page(s) become widgets; start over when the view changes.
+    view_key = (source_choice, st.session_state.selected_subreddit, len(entries))
+    if st.session_state.get("page_view") != view_key:
+        st.session_state.page_view = view_key
+        st.session_state.page = 1
+    shown = st.session_state.page * PAGE_SIZE
+    for i, en in enumerate(entries[:shown], 1):
         render_entry(en, i)
+    if len(entries) > shown and st.button(f"Load more ({len(entries) - shown} remaining)"):
+        st.session_state.page += 1
+        st.rerun(scope="fragment")
+
+
+# ---------------------------
+# Tabs
+# ---------------------------
+tab_feed, tab_help = st.tabs(["Feed", "Help"])
+
+with tab_feed:
+    with st.spinner("Fetching sources…"):
+        buckets, all_entries = fetch_all(
+            sources_cfg, st.session_state.global_filters, enabled, st.session_state.last_fetch_key
+        )
+    render_feed(buckets, all_entries)
 
 with tab_help:
     st.header("Help & Personalization")
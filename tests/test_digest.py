@@ -0,0 +1,33 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+import daily_digest
+from utils import Entry
+
+_NOW = datetime.now(timezone.utc)
+
+
+def _entry(id, hours_ago):
+    return Entry(id=id, title=id, summary="", authors=(), published=_NOW - timedelta(hours=hours_ago),
+                 source="s", category="c", tags=())
+
+
+class DedupeTest(unittest.TestCase):
+    def test_newest_duplicate_wins(self):
+        old, other, new = _entry("a", 5), _entry("b", 3), _entry("a", 1)
+        buckets = daily_digest.dedupe_buckets({"s": [old, other, new]})
+        self.assertEqual(buckets["s"], [new, other])
+
+    def test_fetch_all_keeps_newest_under_cap(self):
+        old, new = _entry("a", 5), _entry("a", 1)
+        fake = mock.Mock(fetch=lambda cfg, gf: [old, new])
+        key, name = daily_digest._SOURCES[0]
+        cfg = {"sources": {k: {"enabled": k == key} for k, _ in daily_digest._SOURCES}}
+        with mock.patch.object(daily_digest.importlib, "import_module", return_value=fake):
+            buckets = daily_digest.fetch_all(cfg, max_per_source=1)
+        self.assertEqual(buckets, {name: [new]})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import os
+import sqlite3
+import tempfile
+import time
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from sources import _feed_cache
+
+
+def _resp(status, content=b"", headers=None):
+    return SimpleNamespace(status_code=status, content=content, headers=headers or {})
+
+
+class FeedCacheTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "feed_cache.sqlite")
+        for patch in (
+            mock.patch.object(_feed_cache, "CACHE_PATH", self.path),
+            mock.patch.object(_feed_cache, "_MIGRATED", False),
+        ):
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def _fetch(self, url, resp):
+        with mock.patch.object(_feed_cache._http, "get_feed", return_value=resp):
+            return _feed_cache.parse_entries(url, parse=lambda content: [content.decode()])
+
+    def _urls(self):
+        with sqlite3.connect(self.path) as con:
+            return {row[0] for row in con.execute("SELECT url FROM feeds")}
+
+    def test_stale_rows_are_evicted_on_store(self):
+        self._fetch("https://a", _resp(200, b"a", {"ETag": "1"}))
+        with sqlite3.connect(self.path) as con:
+            con.execute("UPDATE feeds SET stored = ?", (time.time() - _feed_cache.MAX_AGE_SECONDS - 1,))
+        self._fetch("https://b", _resp(200, b"b", {"ETag": "2"}))
+        self.assertEqual(self._urls(), {"https://b"})
+
+    def test_304_replays_and_refreshes_row(self):
+        self._fetch("https://a", _resp(200, b"a", {"ETag": "1"}))
+        with sqlite3.connect(self.path) as con:
+            con.execute("UPDATE feeds SET stored = 0")
+        self.assertEqual(self._fetch("https://a", _resp(304)), ["a"])
+        self._fetch("https://b", _resp(200, b"b", {"ETag": "2"}))
+        self.assertEqual(self._urls(), {"https://a", "https://b"})
+
+    def test_legacy_table_gains_stored_column(self):
+        with sqlite3.connect(self.path) as con:
+            con.execute("CREATE TABLE feeds (url TEXT PRIMARY KEY, etag TEXT, modified TEXT, entries BLOB)")
+        self._fetch("https://a", _resp(200, b"a", {"ETag": "1"}))
+        self.assertEqual(self._urls(), {"https://a"})
+
+    def test_corrupt_row_on_304_refetches_without_validators(self):
+        self._fetch("https://a", _resp(200, b"a", {"ETag": "1"}))
+        with sqlite3.connect(self.path) as con:
+            con.execute("UPDATE feeds SET entries = ?", (b"not a pickle",))
+        calls = []
+
+        def get_feed(url, etag=None, modified=None, headers=None):
+            calls.append(etag)
+            return _resp(304) if etag else _resp(200, b"fresh", {"ETag": "2"})
+
+        with mock.patch.object(_feed_cache._http, "get_feed", get_feed):
+            entries = _feed_cache.parse_entries("https://a", parse=lambda content: [content.decode()])
+        self.assertEqual(entries, ["fresh"])
+        self.assertEqual(calls, ["1", None])
+
+    def test_unusable_cache_path_falls_back_to_download(self):
+        with mock.patch.object(_feed_cache, "CACHE_PATH", os.path.join(self.path, "x", "cache.sqlite")):
+            open(self.path, "w").close()  # a file where the cache directory should be
+            self.assertEqual(self._fetch("https://a", _resp(200, b"a", {"ETag": "1"})), ["a"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from unittest import mock
+
+from sources import acl, hackernoon, hn
+from sources._feed_parse import feed_entries
+
+_NOW = datetime.now(timezone.utc) - timedelta(hours=1)
+_RFC822 = format_datetime(_NOW)
+_ISO = _NOW.isoformat()
+
+RSS = f"""<?xml version="1.0"?>
+<rss version="2.0" xmlns:dc="http://purl.org/dc/elements/1.1/"><channel><title>t</title>
+<item><title>Language models at scale</title><link>https://example.com/a</link>
+<comments>https://news.ycombinator.com/item?id=1</comments>
+<guid>https://news.ycombinator.com/item?id=1</guid>
+<description><![CDATA[<p>About <b>LLMs</b></p>]]></description>
+<dc:creator>ada</dc:creator><pubDate>{_RFC822}</pubDate></item>
+</channel></rss>""".encode()
+
+ATOM = f"""<?xml version="1.0"?>
+<feed xmlns="http://www.w3.org/2005/Atom"><title>t</title>
+<entry><id>https://aclanthology.org/2024.acl-long.1</id><title>A paper</title>
+<link href="https://aclanthology.org/2024.acl-long.1/"/>
+<summary>abstract</summary><author><name>Ada</name></author>
+<published>{_ISO}</published></entry>
+</feed>""".encode()
+
+RDF = f"""<?xml version="1.0"?>
+<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#" xmlns="http://purl.org/rss/1.0/"
+ xmlns:dc="http://purl.org/dc/elements/1.1/">
+<channel rdf:about="https://example.com/"><title>t</title><link>https://example.com/</link></channel>
+<item rdf:about="https://example.com/b"><title>RDF item</title><link>https://example.com/b</link>
+<dc:date>{_ISO}</dc:date></item>
+</rdf:RDF>""".encode()
+
+ATOM_NO_IDS = f"""<?xml version="1.0"?>
+<feed xmlns="http://www.w3.org/2005/Atom"><title>t</title>
+<entry><title>One</title><link href="https://example.com/1"/><published>{_ISO}</published></entry>
+<entry><title>Two</title><link href="https://example.com/2"/><published>{_ISO}</published></entry>
+</feed>""".encode()
+
+GLOBAL_FILTERS = {"lookback_days": 7, "include_keywords": [], "exclude_keywords": []}
+
+
+def _stub(body):
+    # Stands in for sources._feed_cache.parse_entries: no HTTP, no sqlite.
+    def parse_entries(url, parse=None, headers=None):
+        return parse(body)
+    return parse_entries
+
+
+class FetchTest(unittest.TestCase):
+    def test_hn(self):
+        with mock.patch.object(hn, "parse_entries", _stub(RSS)):
+            entries = hn.fetch({"feeds": ["https://hnrss.org/frontpage"]}, GLOBAL_FILTERS)
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0].title, "[HN] Language models at scale")
+        self.assertEqual(entries[0].link, "https://news.ycombinator.com/item?id=1")
+        self.assertEqual(entries[0].summary, "About LLMs")
+
+    def test_hackernoon(self):
+        with mock.patch.object(hackernoon, "parse_entries", _stub(RSS)):
+            entries = hackernoon.fetch({"feeds": ["https://hackernoon.com/feed"]}, GLOBAL_FILTERS)
+        self.assertEqual(len(entries), 1)
+        self.assertEqual([a["name"] for a in entries[0].authors], ["ada"])
+
+    def test_acl(self):
+        with mock.patch.object(acl, "parse_entries", _stub(ATOM)):
+            entries = acl.fetch({"feeds": ["https://aclanthology.org/events/acl-2024.atom"]}, GLOBAL_FILTERS)
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0].id, "https://aclanthology.org/2024.acl-long.1")
+        self.assertEqual(entries[0].link, "https://aclanthology.org/2024.acl-long.1/")
+
+    def test_acl_without_ids_uses_links(self):
+        with mock.patch.object(acl, "parse_entries", _stub(ATOM_NO_IDS)):
+            entries = acl.fetch({"feeds": ["https://aclanthology.org/events/acl-2024.atom"]}, GLOBAL_FILTERS)
+        self.assertEqual([en.id for en in entries], ["https://example.com/1", "https://example.com/2"])
+
+    def test_include_keywords_match_across_markup(self):
+        body = RSS.replace(b"Language models at scale", b"Scaling up").replace(
+            b"About <b>LLMs</b>", b"Large <b>language</b> models from AT&amp;T"
+        )
+        for keyword in ("language models", "at&t"):
+            filters = dict(GLOBAL_FILTERS, include_keywords=[keyword])
+            for module in (hn, hackernoon):
+                with mock.patch.object(module, "parse_entries", _stub(body)):
+                    entries = module.fetch({"feeds": ["https://example.com/feed"]}, filters)
+                self.assertEqual(len(entries), 1, (module.__name__, keyword))
+
+
+class FeedEntriesTest(unittest.TestCase):
+    def test_rss1_falls_back_to_feedparser(self):
+        entries = feed_entries(RDF)
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0].get("title"), "RDF item")
+
+    def test_malformed_falls_back_to_feedparser(self):
+        self.assertEqual(feed_entries(b"<html><body>not a feed"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
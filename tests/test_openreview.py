@@ -0,0 +1,43 @@
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from sources import openreview as src_openreview
+
+_OLD_MS = 1_500_000_000_000  # 2017
+
+
+def _note(i):
+    return SimpleNamespace(
+        id=f"n{i}", forum=f"f{i}", tmdate=_OLD_MS - i,
+        content={"title": {"value": f"Paper {i}"}, "abstract": {"value": "abs"}},
+    )
+
+
+class FakeClient:
+    def __init__(self, notes):
+        self.notes = notes
+
+    def get_notes(self, content=None, sort=None, limit=None, offset=0):
+        return self.notes[offset:offset + limit]
+
+
+class OpenReviewTest(unittest.TestCase):
+    def _fetch(self, notes, lookback_days):
+        with mock.patch.object(src_openreview, "_client", lambda: FakeClient(notes)), \
+                mock.patch.object(src_openreview, "PAGE_SIZE", 2):
+            return src_openreview.fetch(
+                {"venues": ["ICLR 2025"]},
+                {"lookback_days": lookback_days, "include_keywords": [], "exclude_keywords": []},
+            )
+
+    def test_unlimited_lookback_keeps_old_notes_across_pages(self):
+        entries = self._fetch([_note(i) for i in range(5)], 0)
+        self.assertEqual([en.id for en in entries], [f"n{i}" for i in range(5)])
+
+    def test_lookback_drops_old_notes(self):
+        self.assertEqual(self._fetch([_note(i) for i in range(5)], 7), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import os
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+from utils import clean_html_to_text, compile_keywords, entry_published_dt, keyword_gate, to_utc
+
+
+class KeywordGateTest(unittest.TestCase):
+    def test_gate(self):
+        inc, exc = compile_keywords(["LLM"]), compile_keywords(["crypto"])
+        self.assertTrue(keyword_gate("llm agents", inc, exc))
+        self.assertFalse(keyword_gate("llm crypto", inc, exc))
+        self.assertFalse(keyword_gate("agents", inc, exc))
+        self.assertTrue(keyword_gate("agents", None, exc))
+        self.assertTrue(keyword_gate("anything", None, None))
+
+
+class ToUtcTest(unittest.TestCase):
+    def test_naive_is_local_time(self):
+        naive = datetime(2025, 1, 15, 12, 0)
+        self.assertEqual(to_utc(naive), naive.astimezone(timezone.utc))
+
+    def test_aware(self):
+        d = datetime(2025, 1, 15, 12, 0, tzinfo=timezone(timedelta(hours=2)))
+        self.assertEqual(to_utc(d), datetime(2025, 1, 15, 10, 0, tzinfo=timezone.utc))
+        self.assertIs(to_utc(d).tzinfo, timezone.utc)
+        zero = datetime(2025, 1, 15, 12, 0, tzinfo=timezone(timedelta(0)))
+        self.assertIs(to_utc(zero).tzinfo, timezone.utc)
+        self.assertIsNone(to_utc(None))
+
+
+class EntryPublishedDtTest(unittest.TestCase):
+    def test_rfc822_minus_zero_is_utc(self):
+        try:
+            with mock.patch.dict(os.environ, {"TZ": "Asia/Tokyo"}):
+                time.tzset()
+                d = entry_published_dt({"published": "Tue, 15 Oct 2024 10:00:00 -0000"})
+        finally:
+            time.tzset()
+        self.assertEqual(d, datetime(2024, 10, 15, 10, 0, tzinfo=timezone.utc))
+
+    def test_rfc822_offset(self):
+        d = entry_published_dt({"published": "Tue, 15 Oct 2024 12:00:00 +0200"})
+        self.assertEqual(d, datetime(2024, 10, 15, 10, 0, tzinfo=timezone.utc))
+
+
+class CleanHtmlTest(unittest.TestCase):
+    def test_comment_with_gt_is_dropped(self):
+        self.assertEqual(clean_html_to_text("<p>a <!-- c > d --> b</p>"), "a b")
+
+    def test_plain_markup(self):
+        self.assertEqual(clean_html_to_text("<p>x &amp; <b>y</b></p><script>z()</script>"), "x & y")
+        self.assertEqual(clean_html_to_text("x < y and y > z"), "x < y and y > z")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,30 @@
+import calendar
+import html
 import re
+from dataclasses import dataclass, field
+from functools import lru_cache
 from datetime import datetime, timezone, timedelta
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+@dataclass(slots=True)
+class Entry:
+    """One feed item, as emitted by every sources/*.py fetch()."""
+    id: str
+    title: str
+    summary: str
+    authors: tuple
+    published: Optional[datetime]
+    source: str
+    category: str
+    tags: tuple
+    pdf: str = ""
+    link: str = ""
+    fulltext: str = ""   # Reddit: full selftext behind the preview in `summary`
+    ts: float = field(init=False)  # published as epoch seconds (0.0 if undated), for sorting
+
+    def __post_init__(self):
+        self.ts = self.published.timestamp() if self.published else 0.0
 
 def normalize(s):
     return (s or "").strip()
@@ -20,16 +45,123 @@ def none_keyword_match(text, keywords):
             return False
     return True
 
-def is_recent(published_dt, lookback_days):
+def keyword_gate(hay, include_re, exclude_re):
+    """
+    True when the lower-cased `hay` hits include_re and misses exclude_re, the
+    compile_keywords() patterns a source builds once per fetch (None = no filter).
+    Exclude is checked first, so an excluded item stops after one scan.
+    """
+    if exclude_re is not None and exclude_re.search(hay):
+        return False
+    return include_re is None or include_re.search(hay) is not None
+
+@lru_cache(maxsize=64)
+def _compile_alternation(keywords):
+    return re.compile("|".join(re.escape(kw) for kw in keywords))
+
+def compile_keywords(keywords):
+    """
+    Compile keywords into a single alternation to run against *lower-cased* text
+    (same substring semantics as any_keyword_match). None when there are none.
+    Cached on the sorted keyword set, so repeated fetches (Streamlit reruns) reuse it.
+    """
+    if not keywords:
+        return None
+    return _compile_alternation(tuple(sorted({kw.lower() for kw in keywords})))
+
+def to_utc(d):
+    """
+    Aware UTC datetime, same as d.astimezone(timezone.utc): naive values are taken
+    as local time. Skips the conversion when d is already UTC.
+    """
+    if d is None or d.tzinfo is timezone.utc:
+        return d
+    if d.tzinfo is not None and d.utcoffset() == timedelta(0):
+        return d.replace(tzinfo=timezone.utc)
+    return d.astimezone(timezone.utc)
+
+_COMMENT_RE = re.compile(r"<!--.*?-->", re.S)
+_SCRIPT_STYLE_RE = re.compile(r"<(script|style)\b.*?</\1\s*>", re.I | re.S)
+_TAG_RE = re.compile(r"<[!/?a-zA-Z][^<>]*>")
+_LEFTOVER_TAG_RE = re.compile(r"<[!/?a-zA-Z]")
+
+@lru_cache(maxsize=4096)
+def clean_html_to_text(markup):
+    """
+    Strip tags from a feed summary and collapse whitespace. Plain regex + html.unescape
+    for the usual well-formed snippets; BeautifulSoup only if markup is left over.
+    Memoized: the same summaries recur across feeds and across Streamlit reruns.
+    """
+    if not markup:
+        return ""
+    # If it doesn't look like HTML, return as-is
+    if "<" not in markup and ">" not in markup:
+        return markup.strip()
+    # comments first: a ">" inside one would otherwise end _TAG_RE's match early
+    text = _TAG_RE.sub(" ", _SCRIPT_STYLE_RE.sub(" ", _COMMENT_RE.sub(" ", markup)))
+    if _LEFTOVER_TAG_RE.search(text):
+        from bs4 import BeautifulSoup
+        soup = BeautifulSoup(markup, "lxml")
+        for tag in soup(["script", "style"]):
+            tag.decompose()
+        return " ".join(soup.get_text(separator=" ", strip=True).split())
+    return " ".join(html.unescape(text).split())
+
+@lru_cache(maxsize=4096)
+def _parse_date_str(raw):
+    # feeds repeat timestamps (same build time, same day's batch), so memoize per string
+    try:
+        d = parsedate_to_datetime(raw)
+    except (TypeError, ValueError):
+        pass
+    else:
+        # RFC 822 "-0000" parses naive but means UTC, not local time
+        return d.replace(tzinfo=timezone.utc) if d.tzinfo is None else to_utc(d)
+    try:
+        return to_utc(datetime.fromisoformat(raw.replace("Z", "+00:00")))
+    except ValueError:
+        pass
+    try:
+        from dateutil import parser as dateparser
+        return to_utc(dateparser.parse(raw))
+    except Exception:
+        return None
+
+def entry_published_dt(entry):
+    """
+    Aware UTC datetime of a feedparser entry (published, else updated), or None.
+    feedparser has already parsed these into UTC struct_time; the raw string is only
+    parsed when that's missing: RFC 822, then ISO 8601, dateutil as the slow last resort.
+    """
+    parsed = entry.get("published_parsed") or entry.get("updated_parsed")
+    if parsed:
+        return datetime.fromtimestamp(calendar.timegm(parsed), tz=timezone.utc)
+    raw = (entry.get("published") or entry.get("updated") or "").strip()
+    if not raw:
+        return None
+    return _parse_date_str(raw)
+
+def lookback_cutoff(lookback_days):
+    """Aware UTC datetime `lookback_days` ago, or None when the lookback is off (<= 0)."""
     if not lookback_days or lookback_days <= 0:
-        return True
-    if not published_dt:
-        return True
-    now = datetime.now(timezone.utc)
-    return (now - published_dt) <= timedelta(days=lookback_days)
+        return None
+    return datetime.now(timezone.utc) - timedelta(days=lookback_days)
+
+def is_after_cutoff(published_dt, cutoff_dt):
+    # per-entry check against a cutoff computed once per fetch; undated entries are kept
+    return not cutoff_dt or not published_dt or published_dt >= cutoff_dt
+
+def is_recent(published_dt, lookback_days):
+    return is_after_cutoff(published_dt, lookback_cutoff(lookback_days))
+
+@lru_cache(maxsize=4096)
+def _join_author_names(names):
+    return ", ".join(names)
 
 def format_authors(authors_list):
-    return ", ".join(a.get("name") for a in authors_list or [])
+    # author lists repeat across categories/sources, so memoize on the name tuple
+    # names that are missing/None (e.g. deleted Reddit accounts) are skipped, not joined
+    return _join_author_names(tuple([a["name"] for a in authors_list or () if a.get("name")]))
 
 def ensure_list(val):
     if val is None: return []